@@ -2,53 +2,224 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
-import json
 import re
+from collections.abc import AsyncIterator
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
 from langgraph.graph import END, StateGraph
 
 from github_client import GitHubClient
-from models import AnalyzeState, EvolutionState, Feature, RepoContext, TimelineState, VersionEntry
+from llm_cache import CachedChatGroq
+from models import (
+    COMMIT_EVOLUTION_LIST_ADAPTER,
+    FEATURE_LIST_ADAPTER,
+    PATCH_MAX_CHARS,
+    VERSION_ENTRY_LIST_ADAPTER,
+    AnalyzeState,
+    BatchTimelineState,
+    CommitEvolution,
+    EvolutionState,
+    Feature,
+    RepoContext,
+    TimelineState,
+    VersionEntry,
+)
+
+
+_JSON_FENCE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+# Max features analysed at once in a full sweep (each runs two LLM calls)
+_FEATURE_CONCURRENCY = 5
+
+
+async def _commit_details(gh: GitHubClient, owner: str, repo: str, commits: list[dict]) -> list:
+    """Fetch commit details concurrently; failed fetches come back as exceptions."""
+    return await asyncio.gather(
+        *[gh.commit_detail(owner, repo, c["sha"]) for c in commits],
+        return_exceptions=True,
+    )
+
+
+async def _path_listings(
+    gh: GitHubClient, owner: str, repo: str, files: list[str]
+) -> list[list[dict]]:
+    """Path-filtered commit listing per file; a failed fetch comes back empty."""
+    results = await asyncio.gather(
+        *[gh.commits_for_path(owner, repo, p) for p in files],
+        return_exceptions=True,
+    )
+    return [[] if isinstance(listing, Exception) else listing for listing in results]
+
+
+async def _commits_for_files(
+    gh: GitHubClient, owner: str, repo: str, files: list[str]
+) -> list[dict]:
+    """Union of the path-filtered commit listings for *files*, newest first."""
+    by_sha: dict[str, dict] = {}
+    for listing in await _path_listings(gh, owner, repo, files):
+        for c in listing:
+            by_sha.setdefault(c["sha"], c)
+    return sorted(by_sha.values(), key=lambda c: c["commit"]["committer"]["date"], reverse=True)
+
+
+async def _candidate_commits(
+    gh: GitHubClient, owner: str, repo: str, commits: list[dict], feature_files: list[str]
+) -> list[dict]:
+    """Narrow *commits* to those GitHub reports as touching *feature_files*.
+
+    Tries one GraphQL query first when the client has a token, otherwise the
+    REST path-filtered listings. A key file with no history is not an exact
+    path (a directory or partial name), and only the substring match below can
+    find its commits – so unless every file resolved, the full list is kept.
+    """
+    by_path: list[set[str]] | None = None
+    if gh.has_token:
+        try:
+            by_path = await gh.commits_touching_paths(owner, repo, feature_files)
+        except Exception:
+            pass
+    if by_path is None:
+        listings = await _path_listings(gh, owner, repo, feature_files)
+        by_path = [{c["sha"] for c in listing} for listing in listings]
+    if not all(by_path):
+        return commits
+    touched = set().union(*by_path)
+    return [c for c in commits if c["sha"] in touched]
+
+
+_FEATURE_COMMIT_LIMIT = 100
+
+
+async def _feature_commit_lines(
+    gh: GitHubClient, owner: str, repo: str, files: list[str]
+) -> list[str]:
+    """One summary line per commit touching *files*, oldest first."""
+    # GitHub filters by path server-side, so no per-commit detail is needed
+    relevant = await _commits_for_files(gh, owner, repo, files)
+    relevant_lines: list[str] = []
+
+    # Newest first, so the cap keeps the most recent history
+    for c in relevant[:_FEATURE_COMMIT_LIMIT]:
+        sha = c["sha"][:7]
+        msg = c["commit"]["message"].split("\n")[0]
+        date = c["commit"]["committer"]["date"][:10]
+        relevant_lines.append(f"{date}  {sha}  {msg}")
+
+    if not relevant_lines:
+        all_commits = await gh.commits(owner, repo, per_page=100)
+        relevant_lines = [
+            f"{c['commit']['committer']['date'][:10]}  {c['sha'][:7]}  {c['commit']['message'].split(chr(10))[0]}"
+            for c in all_commits[:30]
+        ]
+
+    # Oldest first
+    relevant_lines.reverse()
+    return relevant_lines
+
+
+def _tail(text: str, limit: int) -> str:
+    """Last *limit* characters of *text*, trimmed to whole lines."""
+    if len(text) <= limit:
+        return text
+    cut = text[-limit:]
+    _, sep, rest = cut.partition("\n")
+    return rest if sep else cut
 
 
+@functools.lru_cache(maxsize=1024)
 def _feature_id(name: str) -> str:
-    return hashlib.md5(name.lower().encode()).hexdigest()[:10]
+    return hashlib.blake2b(name.lower().encode(), digest_size=5).hexdigest()
 
 
 def _parse_json(text: str):
     """Extract JSON from an LLM response that might include markdown fences."""
     text = text.strip()
-    m = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+    m = _JSON_FENCE.search(text)
     if m:
         text = m.group(1).strip()
-    return json.loads(text)
+    return orjson.loads(text)
+
+
+class _JsonArrayStream:
+    """Incrementally split a streamed JSON array into its top-level objects.
+
+    Feed text chunks as they arrive; each call returns the source text of every
+    object completed so far. Scans each character once, so partial output is
+    never re-parsed.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buf: list[str] = []
+
+    def feed(self, chunk: str) -> list[str]:
+        done: list[str] = []
+        for ch in chunk:
+            if self._depth >= 2:
+                self._buf.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = self._depth > 0
+            elif ch in "[{":
+                self._depth += 1
+                if self._depth == 2:
+                    self._buf = [ch]
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 1:
+                    done.append("".join(self._buf))
+        return done
+
+
+def _slim_commit(c: dict) -> dict:
+    """Keep only the fields the agents read from a GitHub commit listing entry.
+
+    Same shape as the API payload, so callers can't tell the difference, but
+    drops the URLs, parents, verification and user objects (~90% of each entry).
+    """
+    commit = c["commit"]
+    return {
+        "sha": c["sha"],
+        "commit": {
+            "message": commit["message"],
+            "author": {"name": commit["author"]["name"]},
+            "committer": {"date": commit["committer"]["date"]},
+        },
+    }
 
 
 def _commits_summary(commits: list[dict]) -> str:
-    lines: list[str] = []
-    for c in commits:
-        sha = c["sha"][:7]
-        msg = c["commit"]["message"].split("\n")[0]
-        date = c["commit"]["committer"]["date"][:10]
-        lines.append(f"{date}  {sha}  {msg}")
-    return "\n".join(lines)
+    # split(..., 1) stops at the first newline instead of splitting the whole message
+    return "\n".join(
+        f"{c['commit']['committer']['date'][:10]}  {c['sha'][:7]}  {c['commit']['message'].split(chr(10), 1)[0]}"
+        for c in commits
+    )
 
 
 def _releases_summary(releases: list[dict], tags: list[dict]) -> str:
-    lines: list[str] = []
     if releases:
-        for r in releases:
-            name = r.get("tag_name", r.get("name", ""))
-            date = (r.get("published_at") or r.get("created_at", ""))[:10]
-            body = (r.get("body") or "")[:200]
-            lines.append(f"{date}  {name}  {body}")
-    elif tags:
-        for t in tags:
-            lines.append(f"tag: {t['name']}  sha: {t['commit']['sha'][:7]}")
-    return "\n".join(lines) if lines else "No releases or tags found."
+        return "\n".join(
+            f"{(r.get('published_at') or r.get('created_at', ''))[:10]}  "
+            f"{r.get('tag_name', r.get('name', ''))}  "
+            f"{(r.get('body') or '')[:200]}"
+            for r in releases
+        )
+    if tags:
+        return "\n".join(f"tag: {t['name']}  sha: {t['commit']['sha'][:7]}" for t in tags)
+    return "No releases or tags found."
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -114,100 +285,123 @@ Return ONLY a JSON array sorted oldest → newest. Example:
 ]
 """
 
+# Built once and shared by every call so the serialized prefix is byte-identical
+_IDENTIFY_FEATURES_SYS = SystemMessage(content=IDENTIFY_FEATURES_SYSTEM)
+_VERSION_TIMELINE_SYS = SystemMessage(content=VERSION_TIMELINE_SYSTEM)
+
 
 # ═══════════════════════════════════════════════════════════════
 #  GRAPH 1 – Analyze Repo  (fetch_context → identify_features)
 # ═══════════════════════════════════════════════════════════════
 
 
-def build_analyze_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
+async def _fetch_context(gh: GitHubClient, state: AnalyzeState) -> AnalyzeState:
+    owner, repo = state["owner"], state["repo"]
+
+    try:
+        info = await gh.repo_info(owner, repo)
+    except Exception as exc:
+        # Surface the real error (403 rate-limit, 404 not found, etc.)
+        msg = str(exc)
+        if "403" in msg:
+            return {"error": f"GitHub API rate limit exceeded. Set GITHUB_TOKEN in your .env file. ({msg})"}
+        elif "404" in msg:
+            return {"error": f"Repository '{owner}/{repo}' not found. Check the URL and make sure it's a public repo."}
+        return {"error": f"Could not access repository: {msg}"}
+
+    default_branch = info.get("default_branch", "main")
+
+    # Everything else only needs (owner, repo, default_branch) – fan out
+    readme, tree, commits, tags, releases = await asyncio.gather(
+        gh.readme(owner, repo),
+        gh.tree(owner, repo, sha=default_branch),
+        gh.commits(owner, repo, per_page=100),
+        gh.tags(owner, repo),
+        gh.releases(owner, repo),
+        return_exceptions=True,
+    )
+    if isinstance(tree, Exception):
+        tree = []
+    for result in (readme, commits, tags, releases):
+        if isinstance(result, Exception):
+            raise result
+
+    commits = [_slim_commit(c) for c in commits]
+
+    # Trim to what identify_features actually sends to the LLM
+    tree_paths = [n["path"] for n in tree if n["type"] == "blob"][:500]
+
+    ctx: RepoContext = {
+        "readme": readme[:8000],
+        "tree_paths": tree_paths,
+        "all_commits_raw": commits,
+        "releases_raw": releases,
+        "tags_raw": tags,
+    }
+
+    return {"context": ctx}
+
+
+def _identify_messages(ctx: RepoContext) -> list:
+    user_prompt = (
+        "## README\n"
+        f"{ctx['readme']}\n\n"
+        "## File tree\n"
+        f"{chr(10).join(ctx['tree_paths'])}\n\n"
+        "## Recent commits (read these carefully for specific features)\n"
+        f"{_commits_summary(ctx['all_commits_raw'][:60])[:6000]}\n\n"
+        "## Releases / tags\n"
+        f"{_releases_summary(ctx['releases_raw'], ctx['tags_raw'])[:2000]}\n"
+    )
+
+    return [
+        _IDENTIFY_FEATURES_SYS,
+        HumanMessage(content=user_prompt),
+    ]
+
+
+def _feature_dict(item: dict) -> dict:
+    return {
+        "id": _feature_id(item["name"]),
+        "name": item["name"],
+        "description": item["description"],
+        "files": item.get("files", []),
+        "versions": [],
+    }
+
+
+def _build_features(raw_text: str) -> list[Feature]:
+    return FEATURE_LIST_ADAPTER.validate_python(
+        [_feature_dict(item) for item in _parse_json(raw_text)]
+    )
+
+
+def build_analyze_graph(llm: CachedChatGroq, gh: GitHubClient) -> StateGraph:
     """Return a compiled LangGraph that analyses a repo and outputs features."""
 
     # ── Node: fetch_context ──────────────────────────────────
 
     async def fetch_context(state: AnalyzeState) -> AnalyzeState:
-        owner, repo = state["owner"], state["repo"]
-
-        try:
-            info = await gh.repo_info(owner, repo)
-        except Exception as exc:
-            # Surface the real error (403 rate-limit, 404 not found, etc.)
-            msg = str(exc)
-            if "403" in msg:
-                return {**state, "error": f"GitHub API rate limit exceeded. Set GITHUB_TOKEN in your .env file. ({msg})"}
-            elif "404" in msg:
-                return {**state, "error": f"Repository '{owner}/{repo}' not found. Check the URL and make sure it's a public repo."}
-            return {**state, "error": f"Could not access repository: {msg}"}
-
-        readme = await gh.readme(owner, repo)
-        default_branch = info.get("default_branch", "main")
-
-        try:
-            tree = await gh.tree(owner, repo, sha=default_branch)
-        except Exception:
-            tree = []
-
-        tree_paths = [n["path"] for n in tree if n["type"] == "blob"]
-        commits = await gh.commits(owner, repo, per_page=100)
-        tags = await gh.tags(owner, repo)
-        releases = await gh.releases(owner, repo)
-
-        ctx: RepoContext = {
-            "readme": readme,
-            "tree_paths": tree_paths,
-            "commits_summary": _commits_summary(commits),
-            "releases_summary": _releases_summary(releases, tags),
-            "all_commits_raw": commits,
-            "releases_raw": releases,
-            "tags_raw": tags,
-        }
-
-        return {**state, "context": ctx}
+        return await _fetch_context(gh, state)
 
     # ── Node: identify_features ──────────────────────────────
 
     async def identify_features(state: AnalyzeState) -> AnalyzeState:
         if state.get("error"):
-            return state
-
-        ctx = state["context"]
-        user_prompt = (
-            "## README\n"
-            f"{ctx['readme'][:8000]}\n\n"
-            "## File tree\n"
-            f"{chr(10).join(ctx['tree_paths'][:500])}\n\n"
-            "## Recent commits (read these carefully for specific features)\n"
-            f"{ctx['commits_summary'][:6000]}\n\n"
-            "## Releases / tags\n"
-            f"{ctx['releases_summary'][:2000]}\n"
-        )
-
-        messages = [
-            SystemMessage(content=IDENTIFY_FEATURES_SYSTEM),
-            HumanMessage(content=user_prompt),
-        ]
+            return {}
 
+        messages = _identify_messages(state["context"])
         response = await llm.ainvoke(messages)
-        raw_text = response.content
 
+        # Parsing + hashing runs in a worker thread to keep the event loop free
         try:
-            items = _parse_json(raw_text)
-        except json.JSONDecodeError:
-            return {**state, "error": "Failed to parse AI response", "features": []}
-
-        features = []
-        for item in items:
-            features.append(
-                {
-                    "id": _feature_id(item["name"]),
-                    "name": item["name"],
-                    "description": item["description"],
-                    "files": item.get("files", []),
-                    "versions": [],
-                }
-            )
+            features = await asyncio.to_thread(_build_features, response.content)
+        except (ValueError, KeyError, TypeError):
+            # Bad JSON or the wrong shape – either way, don't cache it
+            llm.discard(messages)
+            return {"error": "Failed to parse AI response", "features": []}
 
-        return {**state, "features": features}
+        return {"features": features}
 
     # ── Conditional edge: check for errors ───────────────────
 
@@ -235,7 +429,7 @@ def build_analyze_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
 # ═══════════════════════════════════════════════════════════════
 
 
-def build_timeline_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
+def build_timeline_graph(llm: CachedChatGroq, gh: GitHubClient) -> StateGraph:
     """Return a compiled LangGraph that builds a version timeline for one feature."""
 
     # ── Node: gather_commits ─────────────────────────────────
@@ -244,39 +438,15 @@ def build_timeline_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
         owner, repo = state["owner"], state["repo"]
         feature = state["feature"]
 
-        all_commits = await gh.commits(owner, repo, per_page=100)
-        relevant_lines: list[str] = []
-
-        for c in all_commits:
-            try:
-                detail = await gh.commit_detail(owner, repo, c["sha"])
-            except Exception:
-                continue
-            changed_files = [f["filename"] for f in detail.get("files", [])]
-            if any(
-                any(feat_file in cf for cf in changed_files)
-                for feat_file in feature.get("files", [])
-            ):
-                sha = c["sha"][:7]
-                msg = c["commit"]["message"].split("\n")[0]
-                date = c["commit"]["committer"]["date"][:10]
-                relevant_lines.append(f"{date}  {sha}  {msg}")
-
-        if not relevant_lines:
-            relevant_lines = [
-                f"{c['commit']['committer']['date'][:10]}  {c['sha'][:7]}  {c['commit']['message'].split(chr(10))[0]}"
-                for c in all_commits[:30]
-            ]
-
-        # Oldest first
-        relevant_lines.reverse()
+        relevant_lines = await _feature_commit_lines(gh, owner, repo, feature.get("files", []))
 
-        tags = await gh.tags(owner, repo)
-        releases = await gh.releases(owner, repo)
+        # Reuse what the analyze graph already fetched when the caller passes it
+        ctx = state.get("repo_context") or {}
+        tags = ctx.get("tags_raw") or await gh.tags(owner, repo)
+        releases = ctx.get("releases_raw") or await gh.releases(owner, repo)
         r_summary = _releases_summary(releases, tags)
 
         return {
-            **state,
             "commits_for_feature": "\n".join(relevant_lines),
             "releases_summary": r_summary,
         }
@@ -286,18 +456,20 @@ def build_timeline_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
     async def build_timeline(state: TimelineState) -> TimelineState:
         feature = state["feature"]
 
+        # Repo-wide sections go first so every feature of the same repo shares
+        # the longest possible prompt prefix (provider-side prefix caching).
         user_prompt = (
+            "## Releases / tags\n"
+            f"{state['releases_summary'][:2000]}\n\n"
             f"## Feature: {feature['name']}\n"
             f"{feature['description']}\n\n"
             f"Key files: {', '.join(feature.get('files', []))}\n\n"
             "## Commits touching these files (oldest → newest)\n"
-            f"{state['commits_for_feature'][:6000]}\n\n"
-            "## Releases / tags\n"
-            f"{state['releases_summary'][:2000]}\n"
+            f"{_tail(state['commits_for_feature'], 6000)}\n"
         )
 
         messages = [
-            SystemMessage(content=VERSION_TIMELINE_SYSTEM),
+            _VERSION_TIMELINE_SYS,
             HumanMessage(content=user_prompt),
         ]
 
@@ -305,11 +477,12 @@ def build_timeline_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
         raw_text = response.content
 
         try:
-            items = _parse_json(raw_text)
-        except json.JSONDecodeError:
-            return {**state, "versions": [], "error": "Failed to parse timeline"}
+            versions = VERSION_ENTRY_LIST_ADAPTER.validate_python(_parse_json(raw_text))
+        except ValueError:
+            llm.discard(messages)
+            return {"versions": [], "error": "Failed to parse timeline"}
 
-        return {**state, "versions": items}
+        return {"versions": versions}
 
     # ── Build graph ──────────────────────────────────────────
 
@@ -351,8 +524,30 @@ Return ONLY a JSON array in the SAME order as the input commits. Example:
 ]
 """
 
+_EVOLUTION_SYS = SystemMessage(content=EVOLUTION_SYSTEM)
+
+
+def _build_evolution(raw_commits: list[dict], raw_text: str) -> list[CommitEvolution]:
+    """Parse the LLM summaries and merge them back into the commit data."""
+    summaries = _parse_json(raw_text)
+    summary_map = {s["sha"]: s["evolution_summary"] for s in summaries}
 
-def build_evolution_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
+    evolution: list[dict] = []
+    for c in raw_commits:
+        evolution.append({
+            "sha": c["sha"],
+            "date": c["date"],
+            "message": c["message"],
+            "author": c["author"],
+            "files_changed": c["files"],
+            "total_additions": c.get("total_additions", 0),
+            "total_deletions": c.get("total_deletions", 0),
+            "evolution_summary": summary_map.get(c["sha"], "No analysis available."),
+        })
+    return COMMIT_EVOLUTION_LIST_ADAPTER.validate_python(evolution)
+
+
+def build_evolution_graph(llm: CachedChatGroq, gh: GitHubClient) -> StateGraph:
     """Return a compiled LangGraph that explains feature evolution per commit."""
 
     # ── Node: fetch_commit_details ───────────────────────────
@@ -362,29 +557,33 @@ def build_evolution_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
         feature = state["feature"]
         feature_files = feature.get("files", [])
 
-        all_commits = await gh.commits(owner, repo, per_page=100)
+        # Without key files nothing can match – skip the detail fetches entirely
+        if not feature_files:
+            return {"raw_commits": [], "error": "No commits found touching this feature's files."}
+        # One alternation scan per filename instead of a substring test per feature file
+        feat_re = re.compile("|".join(re.escape(p) for p in feature_files))
+
+        ctx = state.get("repo_context") or {}
+        all_commits = ctx.get("all_commits_raw") or await gh.commits(owner, repo, per_page=100)
+        candidates = await _candidate_commits(gh, owner, repo, all_commits, feature_files)
+        details = await _commit_details(gh, owner, repo, candidates)
         relevant: list[dict] = []
 
-        for c in all_commits:
-            try:
-                detail = await gh.commit_detail(owner, repo, c["sha"])
-            except Exception:
+        for c, detail in zip(candidates, details):
+            if isinstance(detail, Exception):
                 continue
 
             changed = detail.get("files", [])
             changed_names = [f["filename"] for f in changed]
 
             # Keep commits that touch any of the feature's files
-            if any(
-                any(feat_file in cf for cf in changed_names)
-                for feat_file in feature_files
-            ):
+            if any(feat_re.search(cf) for cf in changed_names):
                 # Only keep files relevant to this feature + truncate patches
                 relevant_files = []
                 total_additions = 0
                 total_deletions = 0
                 for f in changed:
-                    if any(feat_file in f["filename"] for feat_file in feature_files):
+                    if feat_re.search(f["filename"]):
                         adds = f.get("additions", 0)
                         dels = f.get("deletions", 0)
                         total_additions += adds
@@ -394,7 +593,7 @@ def build_evolution_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
                             "status": f.get("status", "modified"),
                             "additions": adds,
                             "deletions": dels,
-                            "patch": (f.get("patch") or "")[:500],
+                            "patch": (f.get("patch") or "")[:PATCH_MAX_CHARS],
                         })
 
                 relevant.append({
@@ -408,18 +607,18 @@ def build_evolution_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
                 })
 
         if not relevant:
-            return {**state, "raw_commits": [], "error": "No commits found touching this feature's files."}
+            return {"raw_commits": [], "error": "No commits found touching this feature's files."}
 
         # Oldest first
         relevant.reverse()
 
-        return {**state, "raw_commits": relevant}
+        return {"raw_commits": relevant}
 
     # ── Node: analyze_evolution ──────────────────────────────
 
     async def analyze_evolution(state: EvolutionState) -> EvolutionState:
         if state.get("error"):
-            return state
+            return {}
 
         feature = state["feature"]
         raw_commits = state["raw_commits"]
@@ -447,34 +646,21 @@ def build_evolution_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
         )
 
         messages = [
-            SystemMessage(content=EVOLUTION_SYSTEM),
+            _EVOLUTION_SYS,
             HumanMessage(content=user_prompt),
         ]
 
         response = await llm.ainvoke(messages)
 
         try:
-            summaries = _parse_json(response.content)
-        except json.JSONDecodeError:
-            return {**state, "evolution": [], "error": "Failed to parse evolution analysis"}
-
-        # Merge AI summaries back into the commit data
-        summary_map = {s["sha"]: s["evolution_summary"] for s in summaries}
-
-        evolution: list[dict] = []
-        for c in raw_commits[:40]:
-            evolution.append({
-                "sha": c["sha"],
-                "date": c["date"],
-                "message": c["message"],
-                "author": c["author"],
-                "files_changed": c["files"],
-                "total_additions": c.get("total_additions", 0),
-                "total_deletions": c.get("total_deletions", 0),
-                "evolution_summary": summary_map.get(c["sha"], "No analysis available."),
-            })
-
-        return {**state, "evolution": evolution}
+            evolution = await asyncio.to_thread(
+                _build_evolution, raw_commits[:40], response.content
+            )
+        except (ValueError, KeyError, TypeError):
+            llm.discard(messages)
+            return {"evolution": [], "error": "Failed to parse evolution analysis"}
+
+        return {"evolution": evolution}
 
     # ── Build graph ──────────────────────────────────────────
 
@@ -490,22 +676,140 @@ def build_evolution_graph(llm: ChatGroq, gh: GitHubClient) -> StateGraph:
     return graph.compile()
 
 
+# ═══════════════════════════════════════════════════════════════
+#  GRAPH 4 – Batch Timelines  (gather_batch_commits → build_batch_timeline)
+#
+#  Same output as Graph 2, but for every feature of a repo in a single
+#  LLM call so the shared releases/tags context is only sent once.
+# ═══════════════════════════════════════════════════════════════
+
+BATCH_TIMELINE_SYSTEM = """\
+You are a release-notes analyst. Given a repository's releases/tags and, for \
+SEVERAL features, each feature's id, description, key files, and a chronological \
+list of commits that touched those files, produce a LINEAR version timeline for \
+EACH feature.
+
+For each meaningful version milestone, provide:
+  • version – the tag name, or a short commit SHA if no tag exists
+  • date – ISO date (YYYY-MM-DD)
+  • description – 1-2 sentence summary of what changed for THAT feature in that version
+
+Return ONLY a JSON object mapping every feature id to its array of versions, \
+each array sorted oldest → newest. Example:
+{
+  "3f2a9c1b0d": [
+    {"version": "v0.1.0", "date": "2023-01-15", "description": "Initial authentication flow with email/password."},
+    {"version": "v0.2.0", "date": "2023-03-10", "description": "Added OAuth2 support for Google and GitHub."}
+  ],
+  "a81c44e2f7": [
+    {"version": "v0.2.0", "date": "2023-03-10", "description": "Introduced CSV export of dashboard data."}
+  ]
+}
+"""
+
+_BATCH_TIMELINE_SYS = SystemMessage(content=BATCH_TIMELINE_SYSTEM)
+
+
+def build_batch_timeline_graph(llm: CachedChatGroq, gh: GitHubClient) -> StateGraph:
+    """Return a compiled LangGraph that builds timelines for many features at once."""
+
+    # ── Node: gather_batch_commits ───────────────────────────
+
+    async def gather_batch_commits(state: BatchTimelineState) -> BatchTimelineState:
+        owner, repo = state["owner"], state["repo"]
+        features = state["features"]
+
+        per_feature, tags, releases = await asyncio.gather(
+            asyncio.gather(
+                *[_feature_commit_lines(gh, owner, repo, f.get("files", [])) for f in features]
+            ),
+            gh.tags(owner, repo),
+            gh.releases(owner, repo),
+        )
+
+        return {
+            "commits_by_feature": {
+                f["id"]: "\n".join(lines) for f, lines in zip(features, per_feature)
+            },
+            "releases_summary": _releases_summary(releases, tags),
+        }
+
+    # ── Node: build_batch_timeline ───────────────────────────
+
+    async def build_batch_timeline(state: BatchTimelineState) -> BatchTimelineState:
+        sections: list[str] = []
+        for f in state["features"]:
+            sections.append(
+                f"## Feature {f['id']}: {f['name']}\n"
+                f"{f['description']}\n\n"
+                f"Key files: {', '.join(f.get('files', []))}\n\n"
+                "### Commits touching these files (oldest → newest)\n"
+                f"{_tail(state['commits_by_feature'][f['id']], 3000)}"
+            )
+
+        user_prompt = (
+            "## Releases / tags\n"
+            f"{state['releases_summary'][:2000]}\n\n"
+            + "\n\n".join(sections)
+        )
+
+        messages = [
+            _BATCH_TIMELINE_SYS,
+            HumanMessage(content=user_prompt),
+        ]
+
+        response = await llm.ainvoke(messages)
+
+        try:
+            raw = _parse_json(response.content)
+            if not isinstance(raw, dict):
+                raise ValueError("expected an object keyed by feature id")
+            # ValidationError is a ValueError too – one bad entry fails the batch
+            timelines = {
+                f["id"]: VERSION_ENTRY_LIST_ADAPTER.validate_python(raw.get(f["id"]) or [])
+                for f in state["features"]
+            }
+        except ValueError:
+            llm.discard(messages)
+            return {"timelines": {}, "error": "Failed to parse timelines"}
+
+        return {"timelines": timelines}
+
+    # ── Build graph ──────────────────────────────────────────
+
+    graph = StateGraph(BatchTimelineState)
+
+    graph.add_node("gather_batch_commits", gather_batch_commits)
+    graph.add_node("build_batch_timeline", build_batch_timeline)
+
+    graph.set_entry_point("gather_batch_commits")
+    graph.add_edge("gather_batch_commits", "build_batch_timeline")
+    graph.add_edge("build_batch_timeline", END)
+
+    return graph.compile()
+
+
 # ═══════════════════════════════════════════════════════════════
 #  Convenience wrapper
 # ═══════════════════════════════════════════════════════════════
 
 
 class RepoAnalyzerAgent:
-    """High-level wrapper that exposes the three compiled LangGraph agents."""
+    """High-level wrapper that exposes the compiled LangGraph agents."""
 
     def __init__(self, api_key: str, gh: GitHubClient, model: str = "llama-3.3-70b-versatile"):
-        self.llm = ChatGroq(model=model, temperature=0.2, api_key=api_key)
+        # Extra retries: the Groq client backs off exponentially on 429s, which
+        # concurrent sweeps (full_analysis) hit on the free tier
+        self.llm = CachedChatGroq(
+            ChatGroq(model=model, temperature=0.2, api_key=api_key, max_retries=5)
+        )
+        self.gh = gh
         self.analyze_graph = build_analyze_graph(self.llm, gh)
         self.timeline_graph = build_timeline_graph(self.llm, gh)
         self.evolution_graph = build_evolution_graph(self.llm, gh)
+        self.batch_timeline_graph = build_batch_timeline_graph(self.llm, gh)
 
-    async def analyze_repo(self, owner: str, repo: str) -> list[Feature]:
-        """Run the analyze graph and return Feature objects."""
+    async def _analyze(self, owner: str, repo: str) -> AnalyzeState:
         result = await self.analyze_graph.ainvoke(
             {"owner": owner, "repo": repo}
         )
@@ -513,10 +817,52 @@ class RepoAnalyzerAgent:
         if result.get("error"):
             raise RuntimeError(result["error"])
 
-        return [Feature(**f) for f in result.get("features", [])]
+        return result
+
+    async def analyze_repo(self, owner: str, repo: str) -> list[Feature]:
+        """Run the analyze graph and return Feature objects."""
+        result = await self._analyze(owner, repo)
+        return result.get("features", [])
+
+    async def analyze_repo_stream(self, owner: str, repo: str) -> AsyncIterator[dict]:
+        """Same steps as the analyze graph, yielding progress events as they happen.
+
+        Yields ``{"type": "context", ...}`` once the repo is fetched, one
+        ``{"type": "feature", ...}`` per feature as the LLM emits it, then
+        ``{"type": "done"}`` – or a single ``{"type": "error", ...}``.
+        """
+        state = await _fetch_context(self.gh, {"owner": owner, "repo": repo})
+        if state.get("error"):
+            yield {"type": "error", "detail": state["error"]}
+            return
+
+        ctx = state["context"]
+        yield {"type": "context", "tree_size": len(ctx["tree_paths"])}
+
+        messages = _identify_messages(ctx)
+        splitter = _JsonArrayStream()
+        emitted = 0
+        async for chunk in self.llm.astream(messages):
+            for obj in splitter.feed(chunk.content):
+                try:
+                    feature = Feature.model_validate(_feature_dict(orjson.loads(obj)))
+                except (ValueError, KeyError, TypeError):
+                    continue
+                emitted += 1
+                yield {"type": "feature", "feature": feature.model_dump()}
+
+        # Nothing usable came out – don't let the cache replay it on retry
+        if not emitted:
+            self.llm.discard(messages)
+
+        yield {"type": "done"}
 
     async def feature_timeline(
-        self, owner: str, repo: str, feature: Feature
+        self,
+        owner: str,
+        repo: str,
+        feature: Feature,
+        repo_context: RepoContext | None = None,
     ) -> list[VersionEntry]:
         """Run the timeline graph and return VersionEntry objects."""
         result = await self.timeline_graph.ainvoke(
@@ -524,23 +870,47 @@ class RepoAnalyzerAgent:
                 "owner": owner,
                 "repo": repo,
                 "feature": feature.model_dump(),
+                "repo_context": repo_context or {},
             }
         )
 
         if result.get("error"):
             raise RuntimeError(result["error"])
 
-        return [VersionEntry(**v) for v in result.get("versions", [])]
+        return result.get("versions", [])
+
+    async def features_timeline_batch(
+        self, owner: str, repo: str, features: list[Feature]
+    ) -> dict[str, list[VersionEntry]]:
+        """Run the batch timeline graph – one LLM call for all *features*."""
+        result = await self.batch_timeline_graph.ainvoke(
+            {
+                "owner": owner,
+                "repo": repo,
+                "features": [f.model_dump() for f in features],
+            }
+        )
+
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+
+        timelines = result.get("timelines", {})
+        return {f.id: timelines.get(f.id, []) for f in features}
 
     async def feature_evolution(
-        self, owner: str, repo: str, feature: Feature
-    ) -> list[dict]:
+        self,
+        owner: str,
+        repo: str,
+        feature: Feature,
+        repo_context: RepoContext | None = None,
+    ) -> list[CommitEvolution]:
         """Run the evolution graph – returns commit-level feature evolution."""
         result = await self.evolution_graph.ainvoke(
             {
                 "owner": owner,
                 "repo": repo,
                 "feature": feature.model_dump(),
+                "repo_context": repo_context or {},
             }
         )
 
@@ -548,3 +918,36 @@ class RepoAnalyzerAgent:
             raise RuntimeError(result["error"])
 
         return result.get("evolution", [])
+
+    async def full_analysis(
+        self, owner: str, repo: str
+    ) -> tuple[list[Feature], dict[str, list[CommitEvolution]]]:
+        """Analyze the repo, then build every feature's timeline and evolution concurrently.
+
+        A feature whose timeline or evolution fails gets an empty list for it
+        rather than failing the whole sweep.
+        """
+        result = await self._analyze(owner, repo)
+        features = result.get("features", [])
+        ctx = result["context"]
+        sem = asyncio.Semaphore(_FEATURE_CONCURRENCY)
+
+        async def one(feature: Feature):
+            async with sem:
+                return await asyncio.gather(
+                    self.feature_timeline(owner, repo, feature, ctx),
+                    self.feature_evolution(owner, repo, feature, ctx),
+                    return_exceptions=True,
+                )
+
+        results = await asyncio.gather(*[one(f) for f in features])
+
+        completed: list[Feature] = []
+        evolutions: dict[str, list[CommitEvolution]] = {}
+        for feature, (versions, evolution) in zip(features, results):
+            if isinstance(versions, Exception):
+                versions = []
+            completed.append(feature.model_copy(update={"versions": versions}))
+            evolutions[feature.id] = [] if isinstance(evolution, Exception) else evolution
+
+        return completed, evolutions
@@ -2,28 +2,73 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
 
 _BASE = "https://api.github.com"
 
+# Max in-flight requests (keeps us under GitHub's secondary rate limits)
+_MAX_CONCURRENCY = 10
+
 
 class GitHubClient:
     def __init__(self, token: str | None = None):
         headers = {"Accept": "application/vnd.github+json"}
         if token:
             headers["Authorization"] = f"Bearer {token}"
-        self._client = httpx.AsyncClient(base_url=_BASE, headers=headers, timeout=30)
+        # HTTP/2 lets concurrent requests multiplex over one TLS connection
+        self._client = httpx.AsyncClient(
+            base_url=_BASE,
+            headers=headers,
+            timeout=30,
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        )
         self._auth_failed = False
+        # One limit for every request this client makes, however many callers fan out
+        self._sem = asyncio.Semaphore(_MAX_CONCURRENCY)
+        # Commit SHAs are immutable, so details never need revalidating
+        self._detail_cache: LRUCache = LRUCache(maxsize=1024)
+        # (path, params) -> (ETag, decoded body) for conditional GETs
+        self._etag_cache: LRUCache = LRUCache(maxsize=256)
+        # Short-lived memo for repo-level endpoints hit repeatedly per feature
+        self._ttl_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+        # Per-file commit listings get their own memo so a sweep over many
+        # feature files can't evict repo_info/tree/commits from the one above
+        self._path_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+    @property
+    def has_token(self) -> bool:
+        """False without a token, or once GitHub has rejected it."""
+        return "Authorization" in self._client.headers
 
     # ── helpers ──────────────────────────────────────────────
 
-    async def _get_json(self, path: str, params: dict | None = None):
-        r = await self._client.get(path, params=params)
+    @staticmethod
+    def _cache_key(path: str, params: dict | None) -> tuple:
+        return (path, tuple(sorted((params or {}).items())))
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        async with self._sem:
+            return await self._client.request(method, path, **kwargs)
+
+    async def _get_json(self, path: str, params: dict | None = None, conditional: bool = True):
+        key = self._cache_key(path, params)
+        cached = self._etag_cache.get(key) if conditional else None
+        # Conditional request: a 304 reply doesn't count against the rate limit
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        r = await self._request("GET", path, params=params, headers=headers)
         # If token is invalid, drop it and retry unauthenticated (public repos still work)
         if r.status_code == 401 and not self._auth_failed:
             self._auth_failed = True
             self._client.headers.pop("Authorization", None)
-            r = await self._client.get(path, params=params)
+            r = await self._request("GET", path, params=params, headers=headers)
+        if r.status_code == 304 and cached:
+            return cached[1]
         if r.status_code == 403:
             body = r.json() if r.headers.get("content-type", "").startswith("application/json") else {}
             msg = body.get("message", "Forbidden")
@@ -31,16 +76,43 @@ class GitHubClient:
         if r.status_code == 404:
             raise Exception(f"404 Not Found: {path}")
         r.raise_for_status()
-        return r.json()
+        data = orjson.loads(r.content)
+        etag = r.headers.get("ETag")
+        if etag and conditional:
+            self._etag_cache[key] = (etag, data)
+        return data
+
+    async def _cached_get_json(
+        self,
+        path: str,
+        params: dict | None = None,
+        cache: TTLCache | None = None,
+        conditional: bool = True,
+    ):
+        cache = self._ttl_cache if cache is None else cache
+        key = self._cache_key(path, params)
+        if key not in cache:
+            cache[key] = await self._get_json(path, params=params, conditional=conditional)
+        return cache[key]
+
+    async def _graphql(self, query: str, variables: dict) -> dict:
+        # GraphQL requires authentication – unauthenticated calls fail with 401
+        r = await self._request("POST", "/graphql", json={"query": query, "variables": variables})
+        r.raise_for_status()
+        body = orjson.loads(r.content)
+        if body.get("errors"):
+            raise Exception(f"GraphQL error: {body['errors'][0].get('message', 'unknown')}")
+        return body["data"]
 
     # ── public methods ───────────────────────────────────────
 
     async def repo_info(self, owner: str, repo: str) -> dict:
-        return await self._get_json(f"/repos/{owner}/{repo}")
+        return await self._cached_get_json(f"/repos/{owner}/{repo}")
 
     async def readme(self, owner: str, repo: str) -> str:
         """Return raw README text (markdown)."""
-        r = await self._client.get(
+        r = await self._request(
+            "GET",
             f"/repos/{owner}/{repo}/readme",
             headers={"Accept": "application/vnd.github.raw+json"},
         )
@@ -51,33 +123,86 @@ class GitHubClient:
 
     async def tree(self, owner: str, repo: str, sha: str = "HEAD") -> list[dict]:
         """Return the full recursive tree (path + type)."""
-        data = await self._get_json(
+        # Trees can run to tens of MB – hold one copy (the TTL memo), not two
+        data = await self._cached_get_json(
             f"/repos/{owner}/{repo}/git/trees/{sha}",
             params={"recursive": "1"},
+            conditional=False,
         )
         return data.get("tree", [])
 
     async def commits(self, owner: str, repo: str, per_page: int = 100) -> list[dict]:
-        return await self._get_json(
+        return await self._cached_get_json(
             f"/repos/{owner}/{repo}/commits",
             params={"per_page": per_page},
         )
 
+    async def commits_for_path(
+        self, owner: str, repo: str, path: str, per_page: int = 100
+    ) -> list[dict]:
+        """Return commits that touched *path* (filtered server-side by GitHub)."""
+        return await self._cached_get_json(
+            f"/repos/{owner}/{repo}/commits",
+            params={"path": path, "per_page": per_page},
+            cache=self._path_cache,
+        )
+
     async def tags(self, owner: str, repo: str) -> list[dict]:
-        return await self._get_json(f"/repos/{owner}/{repo}/tags")
+        return await self._cached_get_json(f"/repos/{owner}/{repo}/tags")
 
     async def releases(self, owner: str, repo: str) -> list[dict]:
-        return await self._get_json(
+        return await self._cached_get_json(
             f"/repos/{owner}/{repo}/releases",
             params={"per_page": 50},
         )
 
     async def commit_detail(self, owner: str, repo: str, sha: str) -> dict:
-        return await self._get_json(f"/repos/{owner}/{repo}/commits/{sha}")
+        key = (owner, repo, sha)
+        if key not in self._detail_cache:
+            self._detail_cache[key] = await self._get_json(
+                f"/repos/{owner}/{repo}/commits/{sha}", conditional=False
+            )
+        return self._detail_cache[key]
+
+    async def commits_touching_paths(
+        self, owner: str, repo: str, paths: list[str], per_path: int = 100
+    ) -> list[set[str]]:
+        """Return, per path, the SHAs on the default branch that touched it.
+
+        Issues a single GraphQL query with one aliased ``history(path:)``
+        connection per path, instead of one REST detail call per commit.
+        A path that doesn't exist on the branch gets an empty set.
+        """
+        if not paths:
+            return []
+        var_decls = "".join(f", $p{i}: String!" for i in range(len(paths)))
+        histories = "\n".join(
+            f"p{i}: history(first: {per_path}, path: $p{i}) {{ nodes {{ oid }} }}"
+            for i in range(len(paths))
+        )
+        query = (
+            f"query($owner: String!, $name: String!{var_decls}) {{\n"
+            "  repository(owner: $owner, name: $name) {\n"
+            "    defaultBranchRef { target { ... on Commit {\n"
+            f"{histories}\n"
+            "    } } }\n"
+            "  }\n"
+            "}"
+        )
+        variables = {"owner": owner, "name": repo, **{f"p{i}": p for i, p in enumerate(paths)}}
+        data = await self._graphql(query, variables)
+
+        ref = (data.get("repository") or {}).get("defaultBranchRef") or {}
+        target = ref.get("target") or {}
+        return [
+            {node["oid"] for node in (target.get(f"p{i}") or {}).get("nodes", [])}
+            for i in range(len(paths))
+        ]
 
     async def file_content(self, owner: str, repo: str, path: str) -> str:
         """Return raw file content."""
-        r = await self._client.get(
+        r = await self._request(
+            "GET",
             f"/repos/{owner}/{repo}/contents/{path}",
             headers={"Accept": "application/vnd.github.raw+json"},
         )
@@ -0,0 +1,58 @@
+"""In-memory response cache for the Groq chat model."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+from cachetools import TTLCache
+from langchain_core.messages import BaseMessage
+from langchain_groq import ChatGroq
+
+
+class CachedChatGroq:
+    """Wraps ``ChatGroq`` so identical prompts skip the LLM round-trip.
+
+    Keys are a SHA-256 of the model name plus the serialized messages; entries
+    expire after *ttl* seconds. Callers that can't use a response (e.g. it
+    fails to parse) must :meth:`discard` it so a retry reaches the model.
+    """
+
+    def __init__(self, llm: ChatGroq, maxsize: int = 1024, ttl: float = 3600):
+        self.llm = llm
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _key(self, messages: list[BaseMessage]) -> str:
+        payload = json.dumps(
+            [self.llm.model_name, [m.model_dump() for m in messages]],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def ainvoke(self, messages: list[BaseMessage], **kwargs):
+        key = self._key(messages)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self.llm.ainvoke(messages, **kwargs)
+        self._cache[key] = response
+        return response
+
+    async def astream(self, messages: list[BaseMessage], **kwargs):
+        """Stream the response; a cache hit is yielded as a single chunk."""
+        key = self._key(messages)
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        full = None
+        async for chunk in self.llm.astream(messages, **kwargs):
+            full = chunk if full is None else full + chunk
+            yield chunk
+        if full is not None:
+            self._cache[key] = full
+
+    def discard(self, messages: list[BaseMessage]) -> None:
+        """Drop the cached response for *messages*, if any."""
+        self._cache.pop(self._key(messages), None)
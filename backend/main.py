@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import os
 import re
 from contextlib import asynccontextmanager
@@ -11,6 +12,7 @@ import logging
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
 logger = logging.getLogger("gittime")
 
@@ -36,12 +38,20 @@ async def lifespan(app: FastAPI):
         logger.warning("⚠️  GITHUB_TOKEN is not set — GitHub API is limited to 60 req/hr. Add it to backend/.env for higher limits.")
     gh = GitHubClient(token=GITHUB_TOKEN or None)
     agent = RepoAnalyzerAgent(api_key=GROQ_API_KEY, gh=gh)
+    # Build (and cache) the model JSON schemas now rather than on the first /docs hit
+    app.openapi()
     yield
     if gh:
         await gh.close()
 
 
-app = FastAPI(title="GitTime AI", version="1.0.0", lifespan=lifespan)
+# orjson encodes the large evolution/timeline payloads much faster than the stdlib
+app = FastAPI(
+    title="GitTime AI",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -53,14 +63,17 @@ app.add_middleware(
 
 # ── helpers ──────────────────────────────────────────────────
 
+_REPO_SHORT = re.compile(r"^([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)$")
+_REPO_URL = re.compile(r"github\.com/([^/]+)/([^/]+)")
+
 
 def _parse_repo_url(url: str) -> tuple[str, str]:
     """Extract (owner, repo) from a GitHub URL or 'owner/repo' string."""
     url = url.strip().rstrip("/")
-    m = re.match(r"^([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)$", url)
+    m = _REPO_SHORT.match(url)
     if m:
         return m.group(1), m.group(2)
-    m = re.search(r"github\.com/([^/]+)/([^/]+)", url)
+    m = _REPO_URL.search(url)
     if not m:
         raise ValueError("Invalid GitHub repository URL")
     return m.group(1), m.group(2).replace(".git", "")
@@ -86,7 +99,55 @@ async def analyze_repo(req: RepoRequest):
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
-    return AnalysisResponse(repo=f"{owner}/{repo}", features=features)
+    # Serialize in pydantic-core and return the bytes directly – returning the
+    # model would make FastAPI re-validate it against response_model first
+    # Features were validated when the agent parsed the LLM output
+    resp = AnalysisResponse.model_construct(repo=f"{owner}/{repo}", features=features)
+    return Response(content=resp.model_dump_json(), media_type="application/json")
+
+
+@app.post("/api/analyze/stream")
+async def analyze_repo_stream(req: RepoRequest):
+    """Streaming variant of /api/analyze – Server-Sent Events, one feature per event."""
+    assert agent
+
+    try:
+        owner, repo = _parse_repo_url(req.repo_url)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    async def event_stream():
+        try:
+            async for event in agent.analyze_repo_stream(owner, repo):
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as exc:
+            # Headers are already sent, so errors travel as an event
+            yield f"data: {json.dumps({'type': 'error', 'detail': str(exc)})}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/api/full-analysis")
+async def full_analysis(req: RepoRequest):
+    """Run all agents in one request – features, plus each feature's timeline and evolution."""
+    assert agent
+
+    try:
+        owner, repo = _parse_repo_url(req.repo_url)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    try:
+        features, evolutions = await agent.full_analysis(owner, repo)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    return {
+        **AnalysisResponse.model_construct(repo=f"{owner}/{repo}", features=features).model_dump(),
+        "evolutions": {fid: [e.model_dump() for e in evo] for fid, evo in evolutions.items()},
+    }
 
 
 @app.post("/api/feature-timeline")
@@ -96,11 +157,10 @@ async def feature_timeline(req: dict):
 
     try:
         owner, repo = _parse_repo_url(req["repo"])
+        feature = Feature(**req["feature"])
     except (ValueError, KeyError) as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    feature = Feature(**req["feature"])
-
     try:
         versions = await agent.feature_timeline(owner, repo, feature)
     except RuntimeError as exc:
@@ -109,6 +169,25 @@ async def feature_timeline(req: dict):
     return {"feature_id": feature.id, "versions": [v.model_dump() for v in versions]}
 
 
+@app.post("/api/features-timeline")
+async def features_timeline(req: dict):
+    """Run the batch timeline agent – every feature's timeline in one LLM call."""
+    assert agent
+
+    try:
+        owner, repo = _parse_repo_url(req["repo"])
+        features = [Feature(**f) for f in req["features"]]
+    except (ValueError, KeyError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    try:
+        timelines = await agent.features_timeline_batch(owner, repo, features)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    return {fid: [v.model_dump() for v in versions] for fid, versions in timelines.items()}
+
+
 @app.post("/api/feature-evolution")
 async def feature_evolution(req: dict):
     """Run the LangGraph evolution agent – commit-level feature evolution using Agent 1 output."""
@@ -116,17 +195,16 @@ async def feature_evolution(req: dict):
 
     try:
         owner, repo = _parse_repo_url(req["repo"])
+        feature = Feature(**req["feature"])
     except (ValueError, KeyError) as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    feature = Feature(**req["feature"])
-
     try:
         evolution = await agent.feature_evolution(owner, repo, feature)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
-    return {"feature_id": feature.id, "evolution": evolution}
+    return {"feature_id": feature.id, "evolution": [e.model_dump() for e in evolution]}
 
 
 @app.get("/api/health")
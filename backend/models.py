@@ -2,46 +2,87 @@
 
 from __future__ import annotations
 
-from typing import TypedDict
-
-from pydantic import BaseModel
+import datetime
+import sys
+from typing import Annotated, Literal, TypedDict
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+
+__all__ = [
+    "COMMIT_EVOLUTION_LIST_ADAPTER",
+    "FEATURE_LIST_ADAPTER",
+    "PATCH_MAX_CHARS",
+    "VERSION_ENTRY_LIST_ADAPTER",
+    "AnalysisResponse",
+    "AnalyzeState",
+    "BatchTimelineState",
+    "CommitEvolution",
+    "EvolutionState",
+    "Feature",
+    "FileChange",
+    "FileStatus",
+    "LineCount",
+    "RepoContext",
+    "RepoRequest",
+    "TimelineState",
+    "VersionEntry",
+]
 
 
 # ── API request / response models ────────────────────────────
 
 
 class RepoRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     repo_url: str  # e.g. "https://github.com/owner/repo"
 
 
 class VersionEntry(BaseModel):
+    # LLM output – tolerate stray keys rather than failing the whole timeline
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     version: str          # tag name or short SHA
     date: str             # ISO date
     description: str      # AI-generated summary of changes for this feature
 
 
 class Feature(BaseModel):
+    # Also parsed from client request bodies – ignore keys the UI adds
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str
     name: str
     description: str
-    files: list[str]             # key files involved
+    files: tuple[str, ...]       # key files involved
     versions: list[VersionEntry] # linear timeline
 
+    @field_validator("files")
+    @classmethod
+    def _intern_files(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        # Features of one repo share many paths – store each path once
+        return tuple(sys.intern(p) for p in v)
+
 
 class AnalysisResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     repo: str
     features: list[Feature]
 
 
+# Built once at import – validate whole lists in a single core call
+VERSION_ENTRY_LIST_ADAPTER = TypeAdapter(list[VersionEntry])
+FEATURE_LIST_ADAPTER = TypeAdapter(list[Feature])
+
+
 # ── LangGraph agent state ───────────────────────────────────
 
 
 class RepoContext(TypedDict, total=False):
-    """Raw data fetched from GitHub."""
+    """Raw data fetched from GitHub (prompt summaries are rendered on demand)."""
     readme: str
     tree_paths: list[str]
-    commits_summary: str
-    releases_summary: str
     all_commits_raw: list[dict]
     releases_raw: list[dict]
     tags_raw: list[dict]
@@ -52,7 +93,7 @@ class AnalyzeState(TypedDict, total=False):
     owner: str
     repo: str
     context: RepoContext
-    features: list[dict]       # raw dicts before Pydantic conversion
+    features: list[Feature]    # validated inside the node
     error: str
 
 
@@ -61,37 +102,84 @@ class TimelineState(TypedDict, total=False):
     owner: str
     repo: str
     feature: dict              # Feature as dict
+    repo_context: RepoContext  # optional – reused instead of re-fetching
     commits_for_feature: str
     releases_summary: str
-    versions: list[dict]       # VersionEntry dicts
+    versions: list[VersionEntry]  # validated inside the node
+    error: str
+
+
+class BatchTimelineState(TypedDict, total=False):
+    """State flowing through the batch feature-timeline graph."""
+    owner: str
+    repo: str
+    features: list[dict]                  # Feature dicts
+    commits_by_feature: dict[str, str]    # feature id -> commit summary lines
+    releases_summary: str
+    timelines: dict[str, list[VersionEntry]]  # feature id -> validated entries
     error: str
 
 
 # ── Agent 3 – Feature Evolution state ────────────────────────
 
 
+# Patches are cut to this length when fetched from GitHub
+PATCH_MAX_CHARS = 500
+
+
+# GitHub's per-file line counts are never negative
+LineCount = Annotated[int, Field(ge=0, strict=True)]
+
+# Every value GitHub reports for a file in a commit
+FileStatus = Literal["added", "modified", "removed", "renamed", "copied", "changed", "unchanged"]
+
+
 class FileChange(BaseModel):
+    # Built from GitHub's JSON, which is already correctly typed – no coercion
+    model_config = ConfigDict(frozen=True, extra="forbid", strict=True)
+
     filename: str
-    status: str                # added, modified, removed, renamed
-    additions: int             # lines added
-    deletions: int             # lines deleted
-    patch: str                 # truncated diff snippet
+    status: FileStatus
+    additions: LineCount       # lines added
+    deletions: LineCount       # lines deleted
+    patch: str = Field(max_length=PATCH_MAX_CHARS)  # truncated diff snippet
+
+    @field_validator("status")
+    @classmethod
+    def _intern_status(cls, v: str) -> str:
+        # Only a handful of distinct values – share one object per value
+        return sys.intern(v)
 
 
 class CommitEvolution(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     sha: str
-    date: str
+    date: datetime.date        # parsed once from the ISO string
     message: str
     author: str
     files_changed: list[FileChange]
+    total_additions: int = 0
+    total_deletions: int = 0
     evolution_summary: str     # AI-generated: how this commit advanced the feature
 
+    @field_validator("author")
+    @classmethod
+    def _intern_author(cls, v: str) -> str:
+        # The same few authors repeat across a feature's commits
+        return sys.intern(v)
+
+
+# Built once at import – validates a whole evolution list in a single core call
+COMMIT_EVOLUTION_LIST_ADAPTER = TypeAdapter(list[CommitEvolution])
+
 
 class EvolutionState(TypedDict, total=False):
     """State flowing through the feature-evolution graph."""
     owner: str
     repo: str
     feature: dict              # { name, description, files }
+    repo_context: RepoContext  # optional – reused instead of re-fetching
     raw_commits: list[dict]    # commit detail dicts with file changes
-    evolution: list[dict]      # CommitEvolution dicts
+    evolution: list[CommitEvolution]  # validated inside the node
     error: str